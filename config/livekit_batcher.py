@@ -0,0 +1,67 @@
+# config/livekit_batcher.py
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from livekit import api
+from config.livekit_config import get_client
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW = float(os.getenv("LIVEKIT_BATCH_WINDOW_MS", "5")) / 1000
+
+class AsyncBatcher:
+    """
+    Micro-batch lookups arriving within a short window into one backend call
+    Duplicate keys inside a window are only fetched once
+    """
+
+    def __init__(self, fetch_batch: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]], window: float = BATCH_WINDOW):
+        self._fetch_batch = fetch_batch
+        self._window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def load(self, key: Hashable):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.ensure_future(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((key, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self._window)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            waiters: Dict[Hashable, List[asyncio.Future]] = {}
+            for key, future in batch:
+                waiters.setdefault(key, []).append(future)
+
+            try:
+                results = await self._fetch_batch(list(waiters))
+            except Exception as e:
+                logger.error("Batched LiveKit request failed: %s", e)
+                results = {key: e for key in waiters}
+
+            for key, futures in waiters.items():
+                result = results.get(key)
+                for future in futures:
+                    if future.done():
+                        continue
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+async def _fetch_rooms(room_names: List[str]) -> Dict[str, Any]:
+    """One list_rooms call for every requested name; missing rooms map to None"""
+    lk_api = await get_client()
+    response = await lk_api.room.list_rooms(api.ListRoomsRequest(names=room_names))
+    return {room.name: room for room in response.rooms}
+
+room_batcher = AsyncBatcher(_fetch_rooms)
@@ -0,0 +1,110 @@
+# config/livekit_cache.py
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+from livekit import api
+from config.livekit_config import get_client
+from config.livekit_batcher import room_batcher
+
+class RPCCache:
+    """
+    Short-lived cache for LiveKit read RPCs
+    Concurrent misses for the same key share a single in-flight request
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 2.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._store, key))
+        # Shield so one cancelled caller doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    def _store(self, key: Hashable, task: asyncio.Future):
+        # Skip results for keys invalidated while the fetch was in flight
+        if self._inflight.get(key) is not task:
+            return
+        del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self._cache[key] = task.result()
+
+    def invalidate(self, *keys: Hashable):
+        for key in keys:
+            self._cache.pop(key, None)
+            self._inflight.pop(key, None)
+
+rpc_cache = RPCCache(ttl=float(os.getenv("LIVEKIT_CACHE_TTL", "2.0")))
+
+async def list_rooms_cached(lk_api: api.LiveKitAPI):
+    """List all active rooms"""
+    return await rpc_cache.get_or_fetch(
+        ("rooms", None),
+        lambda: lk_api.room.list_rooms(api.ListRoomsRequest())
+    )
+
+async def get_room_cached(room_name: str) -> Optional[api.Room]:
+    """Look up a single room, or None if it doesn't exist"""
+    return await rpc_cache.get_or_fetch(("rooms", room_name), lambda: room_batcher.load(room_name))
+
+async def _list_participants(room_name: str):
+    lk_api = await get_client()
+    return await lk_api.room.list_participants(api.ListParticipantsRequest(room=room_name))
+
+async def list_participants_cached(room_name: str):
+    """List participants in room_name"""
+    # Concurrent calls for a room already share one in-flight request here, and
+    # list_participants takes a single room, so there's nothing left to batch
+    return await rpc_cache.get_or_fetch(
+        ("participants", room_name),
+        lambda: _list_participants(room_name)
+    )
+
+# Rooms recently confirmed to exist, so joins skip the control plane entirely
+_known_rooms = TTLCache(maxsize=4096, ttl=float(os.getenv("LIVEKIT_ROOM_CACHE_TTL", "5.0")))
+_room_locks: Dict[str, asyncio.Lock] = {}
+_room_lock_users: Dict[str, int] = {}
+
+def room_known(room_name: str) -> bool:
+    return room_name in _known_rooms
+
+def mark_room_known(room_name: str):
+    _known_rooms[room_name] = True
+
+@asynccontextmanager
+async def room_lock(room_name: str):
+    """Serialize existence checks for one room so concurrent misses make one RPC"""
+    lock = _room_locks.get(room_name)
+    if lock is None:
+        lock = _room_locks[room_name] = asyncio.Lock()
+    # Count holders and waiters; Lock.locked() is already False on release
+    # even with waiters queued, so it can't tell us when the lock is unused
+    _room_lock_users[room_name] = _room_lock_users.get(room_name, 0) + 1
+    try:
+        async with lock:
+            yield
+    finally:
+        remaining = _room_lock_users[room_name] - 1
+        if remaining:
+            _room_lock_users[room_name] = remaining
+        else:
+            del _room_lock_users[room_name]
+            del _room_locks[room_name]
+
+def invalidate_room(room_name: str):
+    """Drop cached responses affected by a change to room_name"""
+    rpc_cache.invalidate(("rooms", None), ("rooms", room_name), ("participants", room_name))
+    _known_rooms.pop(room_name, None)
@@ -1,61 +1,72 @@
 import os
+import asyncio
+import aiohttp
 from livekit import api
-from contextlib import asynccontextmanager
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Environment is read once at import; main.py loads .env before importing this module
+LIVEKIT_URL = os.getenv("LIVEKIT_URL")
+LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY")
+LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET")
+LIVEKIT_CONFIGURED = bool(LIVEKIT_API_KEY and LIVEKIT_API_SECRET and LIVEKIT_URL)
+ENVIRONMENT = os.getenv("RAILWAY_ENVIRONMENT", "development")
+# Control-plane RPC timeout in seconds; matches the livekit-api default
+LIVEKIT_API_TIMEOUT = float(os.getenv("LIVEKIT_API_TIMEOUT", "10"))
+
+_MISSING_VARS = [
+    name for name, value in (
+        ("LIVEKIT_API_KEY", LIVEKIT_API_KEY),
+        ("LIVEKIT_API_SECRET", LIVEKIT_API_SECRET),
+        ("LIVEKIT_URL", LIVEKIT_URL),
+    ) if not value
+]
+
 def validate_environment():
     """Validate that all required environment variables are set"""
-    required_vars = ["LIVEKIT_API_KEY", "LIVEKIT_API_SECRET", "LIVEKIT_URL"]
-    missing = [var for var in required_vars if not os.getenv(var)]
-    if missing:
-        raise RuntimeError(f"Missing required environment variables: {', '.join(missing)}")
-
-@asynccontextmanager
-async def get_livekit_api():
-    """Get configured LiveKit API client with proper cleanup"""
-    lk_api = None
-    try:
-        lk_api = api.LiveKitAPI(
-            url=os.getenv("LIVEKIT_URL"),
-            api_key=os.getenv("LIVEKIT_API_KEY"),
-            api_secret=os.getenv("LIVEKIT_API_SECRET"),
-        )
-        yield lk_api
-    except Exception as e:
-        logger.error(f"Error with LiveKit API: {e}")
-        raise
-    finally:
-        if lk_api:
-            try:
-                await lk_api.aclose()  # Properly close the client
-            except Exception as e:
-                logger.warning(f"Error closing LiveKit API client: {e}")
-
-# Alternative: Create a singleton client that's managed at the app level
-class LiveKitManager:
-    _instance = None
-    _client = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-    
-    async def get_client(self):
-        if self._client is None:
-            self._client = api.LiveKitAPI(
-                url=os.getenv("LIVEKIT_URL"),
-                api_key=os.getenv("LIVEKIT_API_KEY"),
-                api_secret=os.getenv("LIVEKIT_API_SECRET"),
+    if _MISSING_VARS:
+        raise RuntimeError(f"Missing required environment variables: {', '.join(_MISSING_VARS)}")
+
+# Singleton client that's managed at the app level
+# The client is per process, so each uvicorn worker owns its own
+_client: Optional[api.LiveKitAPI] = None
+_session: Optional[aiohttp.ClientSession] = None
+_client_lock = asyncio.Lock()
+
+async def get_client() -> api.LiveKitAPI:
+    """Get the shared LiveKit API client, creating it on first use"""
+    # Fast path: no lock once the client exists
+    if _client is not None:
+        return _client
+    return await _init_client()
+
+async def _init_client() -> api.LiveKitAPI:
+    global _client, _session
+    async with _client_lock:
+        if _client is None:
+            # Keep-alive pool shared by all control-plane RPCs so bursts reuse TCP+TLS connections
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=75, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=LIVEKIT_API_TIMEOUT),
+            )
+            _client = api.LiveKitAPI(
+                url=LIVEKIT_URL,
+                api_key=LIVEKIT_API_KEY,
+                api_secret=LIVEKIT_API_SECRET,
+                session=_session,
             )
-        return self._client
-    
-    async def close_client(self):
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-
-# Global manager instance
-livekit_manager = LiveKitManager()
\ No newline at end of file
+        return _client
+
+async def close_client():
+    """Close the shared LiveKit API client"""
+    global _client, _session
+    async with _client_lock:
+        if _client:
+            await _client.aclose()
+            _client = None
+        # The client doesn't close a session it was given
+        if _session:
+            await _session.close()
+            _session = None
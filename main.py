@@ -1,22 +1,47 @@
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 import os
+import orjson
 from dotenv import load_dotenv
 import logging
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
 import uvicorn
 
+# Load environment variables before the config modules read them at import
+load_dotenv()
+
 # Import route modules
 from routes.room_management import router as room_router
 from routes.participant_management import router as participant_router
-from config.livekit_config import validate_environment, livekit_manager
-
-# Load environment variables
-load_dotenv()
+from config.livekit_config import validate_environment, get_client, close_client, LIVEKIT_CONFIGURED, ENVIRONMENT
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+def _configure_logging():
+    """
+    Route root logging through a queue; handlers only enqueue records and a
+    background thread does the actual I/O
+    """
+    root = logging.getLogger()
+    # python main.py imports this file twice (__main__, then main:app, or
+    # __mp_main__ plus main in each worker); like basicConfig, only set up once
+    if root.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    # Attach the QueueHandler directly: basicConfig would give it BASIC_FORMAT too,
+    # and the listener's handler would then prefix every record a second time
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+
+_configure_logging()
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
@@ -28,18 +53,21 @@ async def lifespan(app: FastAPI):
         validate_environment()
         logger.info("Environment validation passed")
     except Exception as e:
-        logger.error(f"Environment validation failed: {e}")
+        logger.error("Environment validation failed: %s", e)
         raise
     
+    # Create the shared LiveKit client up front so the first request doesn't pay for it
+    await get_client()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down LiveKit Video Conference API")
     try:
-        await livekit_manager.close_client()
+        await close_client()
         logger.info("LiveKit client closed successfully")
     except Exception as e:
-        logger.warning(f"Error closing LiveKit client: {e}")
+        logger.warning("Error closing LiveKit client: %s", e)
 
 app = FastAPI(
     title="LiveKit Video Conference API",
@@ -49,20 +77,25 @@ app = FastAPI(
 )
 
 # FIXED: Configure CORS properly for Vercel frontend
-ALLOWED_ORIGINS = [
+# Exact origins, computed once at import; extra ones can be added via ALLOWED_ORIGINS (comma-separated)
+ALLOWED_ORIGINS = tuple(dict.fromkeys([
     "http://localhost:3000",
     "http://localhost:5173",  # Vite dev server
     "https://mini-gmeet-frontend.vercel.app",  # Your actual Vercel domain
-    "https://mini-gmeet-frontend-git-main-aldynaufals-projects.vercel.app",  # Git branch domain
-    # Add any other specific Vercel preview URLs you need
-]
+    *(origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "").split(",") if origin.strip()),
+]))
+
+# allow_origins only does exact string matches, so Vercel preview/branch deployments
+# (mini-gmeet-frontend-<hash or git-branch>-aldynaufals-projects.vercel.app) go through a regex
+ALLOWED_ORIGIN_REGEX = r"^https://mini-gmeet-frontend-[a-z0-9-]+-aldynaufals-projects\.vercel\.app$"
 
 # ALTERNATIVE: Allow all origins for development (NOT recommended for production)
-# ALLOWED_ORIGINS = ["*"]
+# ALLOWED_ORIGINS = ("*",)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
+    allow_origin_regex=ALLOWED_ORIGIN_REGEX,
     allow_credentials=True,  
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
@@ -73,66 +106,73 @@ app.add_middleware(
 async def cors_debug():
     return {
         "allowed_origins": ALLOWED_ORIGINS,
+        "allowed_origin_regex": ALLOWED_ORIGIN_REGEX,
         "message": "CORS configuration debug info"
     }
 
 # Include routers
-app.include_router(room_router, prefix="/api", tags=["Room Management"])
+# Participant routes go first so the hot /api/token route is matched early
 app.include_router(participant_router, prefix="/api", tags=["Participant Management"])
+app.include_router(room_router, prefix="/api", tags=["Room Management"])
+
+# Static payloads are serialized once instead of on every request
+_ROOT_BYTES = orjson.dumps({
+    "message": "LiveKit Video Conference API",
+    "status": "running",
+    "version": "1.0.0",
+    "endpoints": {
+        "generate_token": "/api/token",
+        "create_room": "/api/room",
+        "list_rooms": "/api/rooms",
+        "room_info": "/api/room/{room_name}",
+        "participants": "/api/room/{room_name}/participants",
+        "health": "/health"
+    }
+})
+
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "livekit_configured": LIVEKIT_CONFIGURED,
+    "environment": ENVIRONMENT
+})
 
 @app.get("/")
 async def root():
-    return {
-        "message": "LiveKit Video Conference API",
-        "status": "running",
-        "version": "1.0.0",
-        "endpoints": {
-            "generate_token": "/api/token",
-            "create_room": "/api/room",
-            "list_rooms": "/api/rooms",
-            "room_info": "/api/room/{room_name}",
-            "participants": "/api/room/{room_name}/participants",
-            "health": "/health"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {
-        "status": "healthy",
-        "livekit_configured": bool(
-            os.getenv("LIVEKIT_API_KEY") and 
-            os.getenv("LIVEKIT_API_SECRET") and 
-            os.getenv("LIVEKIT_URL")
-        ),
-        "environment": os.getenv("RAILWAY_ENVIRONMENT", "development")
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 # Error handlers
+_NOT_FOUND_BYTES = orjson.dumps({
+    "error": "Endpoint not found",
+    "message": "The requested endpoint does not exist",
+    "available_endpoints": [
+        "/api/token",
+        "/api/room",
+        "/api/rooms",
+        "/api/room/{room_name}",
+        "/api/room/{room_name}/participants", 
+        "/health"
+    ]
+})
+
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
-        status_code=404,
-        content={
-            "error": "Endpoint not found",
-            "message": "The requested endpoint does not exist",
-            "available_endpoints": [
-                "/api/token",
-                "/api/room",
-                "/api/rooms",
-                "/api/room/{room_name}",
-                "/api/room/{room_name}/participants", 
-                "/health"
-            ]
-        }
-    )
+    return Response(content=_NOT_FOUND_BYTES, status_code=404, media_type="application/json")
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2))
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
         reload=False,  # Disable reload in production
+        workers=workers,
+        loop="auto",  # uvloop where installed, asyncio elsewhere (e.g. Windows)
+        http="httptools",
+        access_log=False,  # Skip the synchronous per-request stdout write
         log_level="info"
     )
\ No newline at end of file
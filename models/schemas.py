@@ -1,25 +1,38 @@
 # models/schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 
+# Request bodies stay lenient about unknown fields; responses are only built here
+_REQUEST_CONFIG = ConfigDict(frozen=True)
+_RESPONSE_CONFIG = ConfigDict(frozen=True, extra='forbid')
+
 # Token-related models
 class TokenRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     roomName: str
     participantName: str
     metadata: Optional[str] = None
     maxParticipants: Optional[int] = 100  # Added this field!
 
 class TokenResponse(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     token: str
     wsUrl: str
     roomName: str
     participantName: str
+
 class CreateRoomRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     roomName: str
     maxParticipants: Optional[int] = 10  # More realistic for free tier
     metadata: Optional[str] = None
 
 class RoomInfo(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     name: str
     numParticipants: int
     participants: List[str]
@@ -27,6 +40,8 @@ class RoomInfo(BaseModel):
     metadata: Optional[str] = None
 
 class RoomResponse(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     roomName: str
     sid: str
     maxParticipants: int
@@ -36,6 +51,8 @@ class RoomResponse(BaseModel):
 
 # Participant-related models
 class ParticipantInfo(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     identity: str
     name: str
     sid: str
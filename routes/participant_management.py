@@ -1,105 +1,141 @@
 # routes/participant_management.py
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from livekit import api
 import logging
+import time
 from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
 import jwt as jwt_lib
-import os
 from models.schemas import TokenRequest, TokenResponse
-from config.livekit_config import get_livekit_api, livekit_manager
+from config.livekit_config import get_client, LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET
+from config.livekit_cache import (
+    get_room_cached, list_participants_cached, invalidate_room,
+    room_known, mark_room_known, room_lock
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("/token", response_model=TokenResponse)
-async def generate_livekit_token(request: TokenRequest):
+_GRANTS_TEMPLATE_KWARGS = dict(
+    room_join=True,
+    can_publish=True,
+    can_subscribe=True,
+    can_publish_data=True
+)
+_TOKEN_TTL = timedelta(hours=24)
+
+@lru_cache(maxsize=1024)
+def _video_grants(room: str) -> api.VideoGrants:
+    """Join grants for room; shared between tokens and never mutated"""
+    return api.VideoGrants(room=room, **_GRANTS_TEMPLATE_KWARGS)
+
+@lru_cache(maxsize=4096)
+def _build_jwt(identity: str, room: str, metadata: Optional[str], ttl_bucket: int) -> str:
+    """
+    Build and sign a room join token
+    Cached per hourly ttl_bucket so reconnects reuse a token with at least 23h left
+    """
+    token = (
+        api.AccessToken(LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+        .with_identity(identity)
+        .with_name(identity)
+        .with_grants(_video_grants(room))
+        .with_ttl(_TOKEN_TTL)
+    )
+    
+    if metadata:
+        token.with_metadata(metadata)
+    
+    return token.to_jwt()
+
+@router.post(
+    "/token",
+    # Body is checked by hand and the response built as a dict; both schemas are documented only
+    responses={200: {"model": TokenResponse}},
+    openapi_extra={"requestBody": {"required": True, "content": {"application/json": {"schema": TokenRequest.model_json_schema()}}}}
+)
+async def generate_livekit_token(payload: dict = Body(...), lk_api: api.LiveKitAPI = Depends(get_client)):
     """
     Generate a LiveKit access token for joining a room
     Auto-creates room if it doesn't exist
     """
     try:
-        logger.info(f"Generating token for user {request.participantName} in room {request.roomName}")
+        room_name = payload.get("roomName")
+        participant_name = payload.get("participantName")
+        metadata = payload.get("metadata")
+        max_participants = payload.get("maxParticipants", 100)  # Default to 100
         
-        if not request.roomName or not request.participantName:
+        if not isinstance(room_name, str) or not isinstance(participant_name, str) or not room_name or not participant_name:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Room name and participant name are required"
             )
-        
-        # Read API key & secret from environment at runtime
-        api_key = os.getenv("LIVEKIT_API_KEY")
-        api_secret = os.getenv("LIVEKIT_API_SECRET")
-        ws_url = os.getenv("LIVEKIT_URL")
-        
-        # FIX: Changed condition to properly check if any credential is missing
-        if not api_key or not api_secret or not ws_url:
-            logger.error(f"Missing credentials - API Key: {bool(api_key)}, API Secret: {bool(api_secret)}, URL: {bool(ws_url)}")
+        if metadata is not None and not isinstance(metadata, str):
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="LiveKit credentials are not set"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Metadata must be a string"
+            )
+        if max_participants is not None and (not isinstance(max_participants, int) or isinstance(max_participants, bool)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="maxParticipants must be an integer"
             )
         
-        # Auto-create room if it doesn't exist with configurable max participants
-        max_participants = getattr(request, 'maxParticipants', 100)  # Default to 100
-        await ensure_room_exists(request.roomName, max_participants)
-        
-        # Create access token
-        token = api.AccessToken(api_key, api_secret)
-        token.with_identity(request.participantName)
-        token.with_name(request.participantName)
-        
-        grants = api.VideoGrants(
-            room_join=True,
-            room=request.roomName,
-            can_publish=True,
-            can_subscribe=True,
-            can_publish_data=True
-        )
-        token.with_grants(grants)
-        token.with_ttl(timedelta(hours=24))
+        logger.debug("Generating token for user %s in room %s", participant_name, room_name)
         
-        if request.metadata:
-            token.with_metadata(request.metadata)
+        # Credentials are checked once by validate_environment() at startup
+        # Auto-create room if it doesn't exist with configurable max participants
+        await ensure_room_exists(lk_api, room_name, max_participants)
         
-        jwt_token = token.to_jwt()
+        jwt_token = _build_jwt(
+            participant_name,
+            room_name,
+            metadata,
+            int(time.time() // 3600)
+        )
         
         # Debug: log token payload
-        try:
-            decoded = jwt_lib.decode(jwt_token, options={"verify_signature": False})
-            logger.info(f"Token payload: {decoded}")
-        except Exception as e:
-            logger.warning(f"Could not decode token for debugging: {e}")
-        
-        return TokenResponse(
-            token=jwt_token,
-            wsUrl=ws_url,
-            roomName=request.roomName,
-            participantName=request.participantName
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                decoded = jwt_lib.decode(jwt_token, options={"verify_signature": False})
+                logger.debug("Token payload: %s", decoded)
+            except Exception as e:
+                logger.debug("Could not decode token for debugging: %s", e)
+        
+        return {
+            "token": jwt_token,
+            "wsUrl": LIVEKIT_URL,
+            "roomName": room_name,
+            "participantName": participant_name
+        }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error generating token: {str(e)}")
+        logger.error("Error generating token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate access token: {str(e)}"
         )
 
-async def ensure_room_exists(room_name: str, max_participants: int = 100):
+async def ensure_room_exists(lk_api: api.LiveKitAPI, room_name: str, max_participants: int = 100):
     """Ensure a room exists, create it if it doesn't"""
+    if room_known(room_name):
+        return
     try:
-        # Use the context manager for proper cleanup
-        async with get_livekit_api() as lk_api:
-            # Check if room exists
-            list_request = api.ListRoomsRequest()
-            rooms_response = await lk_api.room.list_rooms(list_request)
+        async with room_lock(room_name):
+            # Another request may have confirmed the room while we waited
+            if room_known(room_name):
+                return
             
-            # Check if room already exists
-            for room in rooms_response.rooms:
-                if room.name == room_name:
-                    logger.info(f"Room {room_name} already exists")
-                    return
+            # Keyed, batched lookup; CreateRoom is get-or-create and would reset an
+            # existing room's max_participants, so only call it for missing rooms
+            if await get_room_cached(room_name) is not None:
+                logger.info("Room %s already exists", room_name)
+                mark_room_known(room_name)
+                return
             
-            # Create room if it doesn't exist
             room_opts = api.CreateRoomRequest(
                 name=room_name,
                 max_participants=max_participants,  # Now configurable!
@@ -107,11 +143,13 @@ async def ensure_room_exists(room_name: str, max_participants: int = 100):
             )
             
             room = await lk_api.room.create_room(room_opts)
-            logger.info(f"Successfully created room: {room_name} with SID: {room.sid} (max: {max_participants} participants)")
-            
+            invalidate_room(room_name)
+            mark_room_known(room_name)
+            logger.info("Successfully created room: %s with SID: %s (max: %s participants)", room_name, room.sid, max_participants)
+        
     except Exception as e:
-        logger.error(f"Error ensuring room exists: {str(e)}")
-        # Don't raise here - room might exist but listing failed
+        logger.error("Error ensuring room exists: %s", e)
+        # Don't raise here - room might exist but the lookup or creation failed
         # The token will still work if the room exists
 
 # Rest of your existing code remains the same...
@@ -121,116 +159,115 @@ async def get_room_participants(room_name: str):
     Get list of participants in a room
     """
     try:
-        async with get_livekit_api() as lk_api:
-            participants_request = api.ListParticipantsRequest(room=room_name)
-            participants_response = await lk_api.room.list_participants(participants_request)
-            
-            participant_list = []
-            for p in participants_response.participants:
-                participant_list.append({
-                    "identity": p.identity,
-                    "name": p.name,
-                    "sid": p.sid,
-                    "state": p.state.name if hasattr(p.state, 'name') else str(p.state),
-                    "joinedAt": p.joined_at,
-                    "metadata": p.metadata,
-                    "permission": {
-                        "canPublish": p.permission.can_publish,
-                        "canSubscribe": p.permission.can_subscribe,
-                        "canPublishData": p.permission.can_publish_data
-                    }
-                })
-            
-            return {
-                "roomName": room_name,
-                "participants": participant_list,
-                "total": len(participant_list)
+        participants_response = await list_participants_cached(room_name)
+        
+        participant_list = [
+            {
+                "identity": p.identity,
+                "name": p.name,
+                "sid": p.sid,
+                "state": p.state.name if hasattr(p.state, 'name') else str(p.state),
+                "joinedAt": p.joined_at,
+                "metadata": p.metadata,
+                "permission": {
+                    "canPublish": p.permission.can_publish,
+                    "canSubscribe": p.permission.can_subscribe,
+                    "canPublishData": p.permission.can_publish_data
+                }
             }
+            for p in participants_response.participants
+        ]
+        
+        return {
+            "roomName": room_name,
+            "participants": participant_list,
+            "total": len(participant_list)
+        }
         
     except Exception as e:
-        logger.error(f"Error getting participants: {str(e)}")
+        logger.error("Error getting participants: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get room participants: {str(e)}"
         )
 
 @router.post("/room/{room_name}/mute/{participant_identity}")
-async def mute_participant(room_name: str, participant_identity: str):
+async def mute_participant(room_name: str, participant_identity: str, lk_api: api.LiveKitAPI = Depends(get_client)):
     """
     Mute a participant's audio
     """
     try:
-        async with get_livekit_api() as lk_api:
-            mute_request = api.MuteRoomTrackRequest(
-                room=room_name,
-                identity=participant_identity,
-                track_sid="",  # Will mute all audio tracks
-                muted=True
-            )
-            await lk_api.room.mute_published_track(mute_request)
-            
-            return {
-                "roomName": room_name,
-                "participantIdentity": participant_identity,
-                "status": "muted"
-            }
+        mute_request = api.MuteRoomTrackRequest(
+            room=room_name,
+            identity=participant_identity,
+            track_sid="",  # Will mute all audio tracks
+            muted=True
+        )
+        await lk_api.room.mute_published_track(mute_request)
+        invalidate_room(room_name)
+        
+        return {
+            "roomName": room_name,
+            "participantIdentity": participant_identity,
+            "status": "muted"
+        }
         
     except Exception as e:
-        logger.error(f"Error muting participant: {str(e)}")
+        logger.error("Error muting participant: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to mute participant: {str(e)}"
         )
 
 @router.post("/room/{room_name}/unmute/{participant_identity}")
-async def unmute_participant(room_name: str, participant_identity: str):
+async def unmute_participant(room_name: str, participant_identity: str, lk_api: api.LiveKitAPI = Depends(get_client)):
     """
     Unmute a participant's audio  
     """
     try:
-        async with get_livekit_api() as lk_api:
-            unmute_request = api.MuteRoomTrackRequest(
-                room=room_name,
-                identity=participant_identity,
-                track_sid="",  # Will unmute all audio tracks
-                muted=False
-            )
-            await lk_api.room.mute_published_track(unmute_request)
-            
-            return {
-                "roomName": room_name,
-                "participantIdentity": participant_identity,
-                "status": "unmuted"
-            }
+        unmute_request = api.MuteRoomTrackRequest(
+            room=room_name,
+            identity=participant_identity,
+            track_sid="",  # Will unmute all audio tracks
+            muted=False
+        )
+        await lk_api.room.mute_published_track(unmute_request)
+        invalidate_room(room_name)
+        
+        return {
+            "roomName": room_name,
+            "participantIdentity": participant_identity,
+            "status": "unmuted"
+        }
         
     except Exception as e:
-        logger.error(f"Error unmuting participant: {str(e)}")
+        logger.error("Error unmuting participant: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to unmute participant: {str(e)}"
         )
 
 @router.post("/room/{room_name}/kick/{participant_identity}")
-async def kick_participant(room_name: str, participant_identity: str):
+async def kick_participant(room_name: str, participant_identity: str, lk_api: api.LiveKitAPI = Depends(get_client)):
     """
     Remove a participant from the room
     """
     try:
-        async with get_livekit_api() as lk_api:
-            remove_request = api.RoomParticipantIdentity(
-                room=room_name,
-                identity=participant_identity
-            )
-            await lk_api.room.remove_participant(remove_request)
-            
-            return {
-                "roomName": room_name,
-                "participantIdentity": participant_identity,
-                "status": "removed"
-            }
+        remove_request = api.RoomParticipantIdentity(
+            room=room_name,
+            identity=participant_identity
+        )
+        await lk_api.room.remove_participant(remove_request)
+        invalidate_room(room_name)
+        
+        return {
+            "roomName": room_name,
+            "participantIdentity": participant_identity,
+            "status": "removed"
+        }
         
     except Exception as e:
-        logger.error(f"Error removing participant: {str(e)}")
+        logger.error("Error removing participant: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to remove participant: {str(e)}"
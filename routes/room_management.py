@@ -1,76 +1,91 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from livekit import api
+import asyncio
 import logging
-from typing import List
+import orjson
+from typing import Any, List, Optional, Tuple
 from models.schemas import CreateRoomRequest, RoomInfo, RoomResponse
-from config.livekit_config import get_livekit_api
+from config.livekit_config import get_client
+from config.livekit_cache import list_rooms_cached, get_room_cached, list_participants_cached, invalidate_room
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# (list_rooms response it was built from, encoded /rooms body)
+_rooms_body: Optional[Tuple[Any, bytes]] = None
+
 @router.post("/room", response_model=RoomResponse)
-async def create_room(request: CreateRoomRequest):
+async def create_room(request: CreateRoomRequest, lk_api: api.LiveKitAPI = Depends(get_client)):
     """
     Create a new LiveKit room
     """
     try:
-        logger.info(f"Creating room: {request.roomName}")
+        logger.info("Creating room: %s", request.roomName)
         
-        async with get_livekit_api() as lk_api:
-            room_opts = api.CreateRoomRequest(
-                name=request.roomName,
-                max_participants=request.maxParticipants or 50,
-                metadata=request.metadata or ""
-            )
-            
-            room = await lk_api.room.create_room(room_opts)
-            
-            logger.info(f"Successfully created room: {request.roomName}")
-            
-            return RoomResponse(
-                roomName=room.name,
-                sid=room.sid,
-                maxParticipants=room.max_participants,
-                creationTime=room.creation_time,
-                metadata=room.metadata,
-                status="created"
-            )
+        room_opts = api.CreateRoomRequest(
+            name=request.roomName,
+            max_participants=request.maxParticipants or 50,
+            metadata=request.metadata or ""
+        )
+        
+        room = await lk_api.room.create_room(room_opts)
+        invalidate_room(request.roomName)
+        
+        logger.info("Successfully created room: %s", request.roomName)
+        
+        return RoomResponse(
+            roomName=room.name,
+            sid=room.sid,
+            maxParticipants=room.max_participants,
+            creationTime=room.creation_time,
+            metadata=room.metadata,
+            status="created"
+        )
         
     except Exception as e:
-        logger.error(f"Error creating room: {str(e)}")
+        logger.error("Error creating room: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create room: {str(e)}"
         )
 
 @router.get("/rooms")
-async def list_rooms():
+async def list_rooms(lk_api: api.LiveKitAPI = Depends(get_client)):
     """
     List all active LiveKit rooms
     """
+    global _rooms_body
     try:
-        async with get_livekit_api() as lk_api:
-            list_request = api.ListRoomsRequest()
-            rooms_response = await lk_api.room.list_rooms(list_request)
-            
-            room_list = []
-            for room in rooms_response.rooms:
-                room_list.append({
-                    "name": room.name,
-                    "sid": room.sid,
-                    "numParticipants": room.num_participants,
-                    "maxParticipants": room.max_participants,
-                    "creationTime": room.creation_time,
-                    "metadata": room.metadata
-                })
-            
-            return {
-                "rooms": room_list,
-                "total": len(room_list)
+        rooms_response = await list_rooms_cached(lk_api)
+        
+        # The TTL cache hands back the same response object until it expires or is
+        # invalidated, so the encoded body can be reused for as long as that holds
+        cached = _rooms_body
+        if cached is not None and cached[0] is rooms_response:
+            return Response(content=cached[1], media_type="application/json")
+        
+        room_list = [
+            {
+                "name": room.name,
+                "sid": room.sid,
+                "numParticipants": room.num_participants,
+                "maxParticipants": room.max_participants,
+                "creationTime": room.creation_time,
+                "metadata": room.metadata
             }
+            for room in rooms_response.rooms
+        ]
+        
+        body = orjson.dumps({
+            "rooms": room_list,
+            "total": len(room_list)
+        })
+        _rooms_body = (rooms_response, body)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Error listing rooms: {str(e)}")
+        logger.error("Error listing rooms: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to list rooms: {str(e)}"
@@ -82,60 +97,62 @@ async def get_room_info(room_name: str):
     Get detailed information about a specific room
     """
     try:
-        async with get_livekit_api() as lk_api:
-            list_request = api.ListRoomsRequest()
-            rooms_response = await lk_api.room.list_rooms(list_request)
-            
-            for room in rooms_response.rooms:
-                if room.name == room_name:
-                    # Get participants
-                    participants_request = api.ListParticipantsRequest(room=room_name)
-                    participants_response = await lk_api.room.list_participants(participants_request)
-                    
-                    participant_names = [p.name for p in participants_response.participants]
-                    
-                    return RoomInfo(
-                        name=room.name,
-                        numParticipants=room.num_participants,
-                        participants=participant_names,
-                        creationTime=room.creation_time,
-                        metadata=room.metadata
-                    )
-            
+        # Batched room lookup and participant listing, in parallel
+        room, participants_response = await asyncio.gather(
+            get_room_cached(room_name),
+            list_participants_cached(room_name),
+            return_exceptions=True
+        )
+        
+        if isinstance(room, Exception):
+            raise room
+        if room is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Room '{room_name}' not found"
             )
+        if isinstance(participants_response, Exception):
+            raise participants_response
+        
+        participant_names = [p.name for p in participants_response.participants]
+        
+        return RoomInfo(
+            name=room.name,
+            numParticipants=room.num_participants,
+            participants=participant_names,
+            creationTime=room.creation_time,
+            metadata=room.metadata
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting room info: {str(e)}")
+        logger.error("Error getting room info: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get room information: {str(e)}"
         )
 
 @router.delete("/room/{room_name}")
-async def delete_room(room_name: str):
+async def delete_room(room_name: str, lk_api: api.LiveKitAPI = Depends(get_client)):
     """
     Delete a LiveKit room
     """
     try:
-        async with get_livekit_api() as lk_api:
-            delete_request = api.DeleteRoomRequest(room=room_name)
-            await lk_api.room.delete_room(delete_request)
-            
-            logger.info(f"Successfully deleted room: {room_name}")
-            
-            return {
-                "roomName": room_name,
-                "status": "deleted",
-                "message": f"Room '{room_name}' has been deleted"
-            }
+        delete_request = api.DeleteRoomRequest(room=room_name)
+        await lk_api.room.delete_room(delete_request)
+        invalidate_room(room_name)
+        
+        logger.info("Successfully deleted room: %s", room_name)
+        
+        return {
+            "roomName": room_name,
+            "status": "deleted",
+            "message": f"Room '{room_name}' has been deleted"
+        }
         
     except Exception as e:
-        logger.error(f"Error deleting room: {str(e)}")
+        logger.error("Error deleting room: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete room: {str(e)}"